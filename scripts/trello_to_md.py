@@ -5,21 +5,41 @@
 
 import argparse
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import io
 import json
 import os
 import re
+import sys
+import tarfile
 
 from datetime import datetime, timezone
 from pathlib import Path
 
+try:
+    import orjson # optional, parses large exports faster
+except ImportError:
+    orjson = None
+
 REPO_DIR = Path(__file__).resolve().parent.parent
 
 DEFAULT_INPUT = REPO_DIR / 'tmp/trello_export.json'
 DEFAULT_OUTPUT = REPO_DIR / 'tmp/kanban'
 
+_INVALID_FN_RE = re.compile(r'[<>:"/\\|?*]')
+
+_YAML_TRANS = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': ' ', '\r': ''})
+
+# interned so hot comparisons hit pointer identity first
+_COMPLETE = sys.intern('complete')
+
+_DONE_STR = ('false', 'true') # indexed by the state == complete bool
+_ITEM_LINE = '    - { idx: %d, desc: %s, done: %s }'
+
 def sanitize_filename(name: str) -> str:
     """Sanitize string for filenames"""
-    name = re.sub(r'[<>:"/\\|?*]', '', name) # remove invalid characters
+    name = _INVALID_FN_RE.sub('', name) # remove invalid characters
     name = name.replace(' ', '_') # replace spaces with dashes
     name = name.strip(' -') # remove leading/trailing dashes/whitespace
     return name.lower()
@@ -29,75 +49,90 @@ def sanitize_link_text(text) -> str:
     text = text.replace('[', '(').replace(']', ')') # replace brackets for Obsidian compatibility
     return text.strip()
 
-def get_yaml_checklists(card_id, checklists) -> list:
+def get_yaml_checklists(card_checklists) -> list:
     """Builds YAML list of tasks"""
-    card_checklists = [cl for cl in checklists if cl['idCard'] == card_id]
     yaml_tasks = []
 
     for cl in card_checklists:
         for item in cl['checkItems']:
             yaml_tasks.append({
                 "desc": '"' + item['name'] + '"',
-                "done": item['state'] == 'complete'
+                "done": item['state'] == _COMPLETE
             })
 
     return yaml_tasks
 
+@lru_cache(maxsize=4096)
 def escape_yaml_string(val: str) -> str:
     """Manually escape string for YAML"""
     if not val:
         return '""'
 
-    val = str(val).replace('\\', '\\\\').replace('"', '\\"')
-    val = val.replace('\n', ' ').replace('\r', '')
-    return f'"{val}"'
-
-def build_frontmatter(card, labels_map, list_pos, checklists_data) -> str:
+    return f'"{str(val).translate(_YAML_TRANS)}"'
+
+# frontmatter skeleton; %s slots for the optional sections take prebuilt
+# blocks that are either empty or newline-terminated
+_FM_TEMPLATE = (
+    "---\n"
+    "title: %s\n"
+    "id: %d\n"
+    "%s"
+    "list_order: %d\n"
+    "%s%s%s"
+    "trello_data:\n"
+    "  id: %s\n"
+    "  url: %s\n"
+    "  date_closed: %s\n"
+    "  date_last_activity: %s\n"
+    "  date_completed: %s\n"
+    "---\n"
+)
+
+def build_frontmatter(card, escaped_labels_map, list_pos, card_checklists, created_ts) -> str:
     """Build markdown frontmatter for Trello card"""
-    lines = ["---"]
-    lines.append(f"title: {escape_yaml_string(card['name'])}")
-    lines.append(f"id: {int(card['idShort'])}")
-
     last_activity = card.get('dateLastActivity', '')
     if last_activity:
-        lines.append(f"created: {last_activity}")
-        lines.append(f"updated: {last_activity}")
+        dates_block = f"created: {last_activity}\nupdated: {last_activity}\n"
     else:
-        lines.append(f"created: {datetime.now(timezone.utc).isoformat()}")
-    lines.append(f"list_order: {list_pos}")
+        dates_block = f"created: {created_ts}\n"
 
-    labels = [labels_map[lbl_id] for lbl_id in card['idLabels'] if lbl_id in labels_map]
+    labels = [escaped_labels_map[lbl_id] for lbl_id in card['idLabels'] if lbl_id in escaped_labels_map]
+    labels_block = ""
     if labels:
-        lines.append("labels:")
-        for label in labels:
-            lines.append(f"  - {escape_yaml_string(label)}")
-
-    if card.get('due'):
-        lines.append(f"due: {card['due']}")
-
-    checklists = [cl for cl in checklists_data if cl['idCard'] == card['id']]
-    if checklists:
-        label = checklists[0].get('name', 'Checklist')
-        lines.append("checklist:")
-        lines.append(f"  label: {escape_yaml_string(label)}")
-        lines.append("  items:")
-        idx = 0
-        for cl in checklists:
-            for item in sorted(cl['checkItems'], key=lambda x: x['pos']):
-                desc = escape_yaml_string(item['name'])
-                is_done = "true" if item['state'] == 'complete' else "false"
-                lines.append(f"    - {{ idx: {idx}, desc: {desc}, done: {is_done} }}")
-                idx += 1
-
-    lines.append("trello_data:")
-    lines.append(f"  id: {card['id']}")
-    lines.append(f"  url: {card['url']}")
-    lines.append(f"  date_closed: {card['dateClosed']}")
-    lines.append(f"  date_last_activity: {card['dateLastActivity']}")
-    lines.append(f"  date_completed: {card['dateCompleted']}")
-
-    lines.append("---\n")
-    return "\n".join(lines)
+        labels_block = "labels:\n" + "\n".join(f"  - {l}" for l in labels) + "\n"
+
+    due_line = f"due: {card['due']}\n" if card.get('due') else ""
+
+    checklist_block = ""
+    if card_checklists:
+        label = card_checklists[0].get('name', 'Checklist')
+        items = [item for cl in card_checklists for item in cl['checkItems']]
+        item_lines = "\n".join(
+            _ITEM_LINE % (idx, escape_yaml_string(item['name']), _DONE_STR[item['state'] == _COMPLETE])
+            for idx, item in enumerate(items)
+        )
+        checklist_block = (f"checklist:\n  label: {escape_yaml_string(label)}\n"
+                           "  items:\n" + (item_lines + "\n" if item_lines else ""))
+
+    return _FM_TEMPLATE % (
+        escape_yaml_string(card['name']), int(card['idShort']), dates_block, list_pos,
+        labels_block, due_line, checklist_block,
+        card['id'], card['url'], card['dateClosed'],
+        card['dateLastActivity'], card['dateCompleted'],
+    )
+
+def _card_payload(i, card, escaped_labels_map, card_checklists, created_ts) -> bytes:
+    """Build the full markdown file contents for a card"""
+    body = f"# {card['name']}\n\n{card['desc']}\n"
+    frontmatter = build_frontmatter(card, escaped_labels_map, i, card_checklists, created_ts)
+    return (frontmatter + body).encode('utf-8')
+
+def _write_card(task) -> None:
+    """Build and write a single card markdown file"""
+    i, card, file_path, escaped_labels_map, card_checklists, created_ts = task
+
+    with open(file_path, 'wb') as f:
+        f.write(_card_payload(i, card, escaped_labels_map, card_checklists, created_ts))
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Convert Trello export JSON to directory/markdown file structure")
@@ -106,6 +141,8 @@ def main() -> None:
                         help=f"Path to Trello export JSON (default: {DEFAULT_INPUT})")
     parser.add_argument('-o', '--output', type=Path, default=DEFAULT_OUTPUT,
                         help=f"Output directory for kanban board (default: {DEFAULT_OUTPUT})")
+    parser.add_argument('--tar', type=Path, default=None,
+                        help="Write the board as a single tar archive instead of a directory tree")
 
     args = parser.parse_args()
 
@@ -114,48 +151,84 @@ def main() -> None:
 
     print(f"Reading Trello export JSON {input_file}...")
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if orjson is not None:
+            with open(input_file, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(input_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
     except FileNotFoundError:
         print(f"Error: Could not find {input_file}.")
         exit(1)
 
-    active_list_ids = set()
+    # intern list ids so sorting/grouping compares by pointer identity
     for card in data['cards']:
-        active_list_ids.add(card['idList'])
+        card['idList'] = sys.intern(card['idList'])
 
-    valid_lists = []
-    for lst in sorted(data['lists'], key=lambda k: k['pos']):
-        if lst['id'] in active_list_ids:
-            valid_lists.append(lst)
+    # one global sort, then grouping preserves per-list pos order
+    data['cards'].sort(key=lambda c: (c['idList'], c['pos']))
 
     cards_by_list = defaultdict(list)
     for card in data['cards']:
         cards_by_list[card['idList']].append(card)
+    active_list_ids = cards_by_list.keys()
 
-    labels_map = {l['id']: l['name'] if l['name'] else l['color'] for l in data['labels']}
-    for lst in valid_lists:
-        list_id = lst['id']
-        list_name = lst['name']
-
-        folder_name = sanitize_filename(list_name)
-        list_dir = os.path.join(output_dir, folder_name)
-        os.makedirs(list_dir, exist_ok=True)
-
-        print(f"  Processing List: {list_name}")
-        list_cards = cards_by_list.get(list_id, [])
-        list_cards.sort(key=lambda k: k['pos'])
-
-        for i, card in enumerate(list_cards, start=1):
-            filename = f"{card['idShort']}.md"
-            file_path = os.path.join(list_dir, filename)
-
-            body = f"# {card['name']}\n\n{card['desc']}\n"
-            frontmatter = build_frontmatter(card, labels_map, i, data.get('checklists', []))
+    valid_lists = []
+    for lst in sorted(data['lists'], key=lambda k: k['pos']):
+        if lst['id'] in active_list_ids:
+            valid_lists.append(lst)
 
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(frontmatter)
-                f.write(body)
+    labels_map = {l['id']: (l['name'] or l['color']) for l in data['labels']}
+    escaped_labels_map = {k: escape_yaml_string(v) for k, v in labels_map.items()}
+
+    created_ts = datetime.now(timezone.utc).isoformat()
+
+    checklists_by_card = defaultdict(list)
+    for cl in data.get('checklists', []):
+        cl['checkItems'] = sorted(cl['checkItems'], key=lambda x: x['pos'])
+        checklists_by_card[cl['idCard']].append(cl)
+
+    if args.tar:
+        # one sequential archive write instead of thousands of tiny files
+        export_mtime = int(datetime.fromisoformat(created_ts).timestamp())
+        with tarfile.open(args.tar, 'w') as tar:
+            for lst in valid_lists:
+                folder_name = sanitize_filename(lst['name'])
+                print(f"  Processing List: {lst['name']}")
+
+                for i, card in enumerate(cards_by_list.get(lst['id'], []), start=1):
+                    payload = _card_payload(i, card, escaped_labels_map,
+                                            checklists_by_card.get(card['id'], []), created_ts)
+                    ti = tarfile.TarInfo(name=f"{folder_name}/{card['idShort']}.md")
+                    ti.size = len(payload)
+                    ti.mtime = export_mtime
+                    tar.addfile(ti, io.BytesIO(payload))
+
+        print(f"Converted Trello to Markdown archive at {os.path.abspath(args.tar)}")
+        return
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        for lst in valid_lists:
+            list_id = lst['id']
+            list_name = lst['name']
+
+            folder_name = sanitize_filename(list_name)
+            list_dir = os.path.join(output_dir, folder_name)
+            try:
+                os.mkdir(list_dir)
+            except FileExistsError:
+                pass
+
+            print(f"  Processing List: {list_name}")
+            list_cards = cards_by_list.get(list_id, [])
+
+            prefix = os.fspath(list_dir) + os.sep
+            tasks = [(i, card, prefix + f"{card['idShort']}.md", escaped_labels_map,
+                      checklists_by_card.get(card['id'], []), created_ts)
+                     for i, card in enumerate(list_cards, start=1)]
+            list(executor.map(_write_card, tasks)) # drain to surface exceptions
 
     print(f"Converted Trello to Markdown at {os.path.abspath(output_dir)}")
 